@@ -1,6 +1,7 @@
 """
 CFIA Membrane Backend Quart Application
 """
+import logging
 import traceback
 
 from quart import jsonify, request
@@ -11,8 +12,9 @@ from error_handlers import register_error_handlers
 from jwt_utils import (
     JWTConfig,
     JWTError,
-    decode_client_jwt_token,
+    decode_client_jwt_token_async,
     generate_email_verification_token,
+    hash_token,
     login_redirect_with_client_jwt,
     redirect_to_client_app_using_verification_token,
 )
@@ -27,8 +29,10 @@ register_error_handlers(app)
 @app.before_request
 async def log_request_info():
     """Log incoming request headers and body for debugging purposes."""
-    app.logger.debug("Headers: %s", request.headers)
-    app.logger.debug("Body: %s", await request.get_data())
+    # Skip reading the request body when it would not be logged.
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug("Headers: %s", request.headers)
+        app.logger.debug("Body: %s", await request.get_data())
 
 
 @app.route("/health", methods=["GET"])
@@ -62,16 +66,23 @@ async def authenticate():
 
     try:
         client_app_token = request.args.get("token")
-        client_app_decoded_token = decode_client_jwt_token(client_app_token, jwt_config)
+        # Shared by every lookup of this token, whichever way it is decoded.
+        token_hash = hash_token(client_app_token) if client_app_token else None
+        client_app_decoded_token = await decode_client_jwt_token_async(
+            client_app_token,
+            jwt_config,
+            app.config.get("JWT_VERIFICATION_EXECUTOR"),
+            token_hash,
+        )
 
         if client_app_decoded_token and request.is_json:
             email = validate_email_from_request(
                 (await request.get_json()).get("email"),
-                email_config.validation_pattern,
+                email_config.validation_regex,
             )
             body = generate_email_verification_token(
                 email,
-                client_app_decoded_token[jwt_config.redirect_url_field],
+                client_app_decoded_token.redirect_url,
                 jwt_config,
             )
 
@@ -82,13 +93,14 @@ async def authenticate():
                 app.config["MEMBRANE_FRONTEND"],
                 client_app_token,
                 jwt_config,
+                token_hash,
             )
 
     except (JWTError, EmailError) as error:
         app.logger.error("Error occurred: %s\n%s", error, traceback.format_exc())
         try:
             return redirect_to_client_app_using_verification_token(
-                client_app_token, jwt_config
+                client_app_token, jwt_config, token_hash
             )
         except JWTError as inner_error:
             app.logger.error(
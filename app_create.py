@@ -3,7 +3,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
-from azure.communication.email import EmailClient
+from azure.communication.email.aio import EmailClient
+from azure.core.pipeline.transport import AioHttpTransport
 from dotenv import load_dotenv
 from quart import Quart
 from quart_cors import cors
@@ -22,6 +23,7 @@ DEFAULT_MEMBRANE_SESSION_LIFETIME_SECONDS = 300
 DEFAULT_MEMBRANE_SESSION_COOKIE_SECURE = "true"
 DEFAULT_MEMBRANE_SESSION_TYPE = "null"
 DEFAULT_MEMBRANE_GENERIC_500_ERROR_FIELD = "error"
+DEFAULT_MEMBRANE_JWT_VERIFICATION_WORKERS = 0
 DEFAULT_MEMBRANE_GENERIC_500_ERROR = (
     "An unexpected error occurred. Please try again later."
 )
@@ -64,15 +66,34 @@ def create_app():
                 "MEMBRANE_JWT_EXPIRE_SECONDS", jwt_utils.DEFAULT_JWT_EXPIRE_SECONDS
             )
         ),
-        token_blacklist=set(
+        token_blacklist=jwt_utils.TokenBlacklist(
             os.getenv(
                 "MEMBRANE_TOKEN_BLACKLIST", jwt_utils.DEFAULT_TOKEN_BLACKLIST
-            ).split(",")
+            ).split(","),
+            maxsize=int(
+                os.getenv(
+                    "MEMBRANE_TOKEN_BLACKLIST_SIZE",
+                    jwt_utils.DEFAULT_TOKEN_BLACKLIST_SIZE,
+                )
+            ),
+        ),
+        client_token_cache_size=int(
+            os.getenv(
+                "MEMBRANE_CLIENT_TOKEN_CACHE_SIZE",
+                jwt_utils.DEFAULT_CLIENT_TOKEN_CACHE_SIZE,
+            )
+        ),
+        client_token_cache_ttl_seconds=int(
+            os.getenv(
+                "MEMBRANE_CLIENT_TOKEN_CACHE_TTL_SECONDS",
+                jwt_utils.DEFAULT_CLIENT_TOKEN_CACHE_TTL_SECONDS,
+            )
         ),
     )
     email_config = emails.EmailConfig(
         email_client=EmailClient.from_connection_string(
-            os.getenv("MEMBRANE_COMM_CONNECTION_STRING")
+            os.getenv("MEMBRANE_COMM_CONNECTION_STRING"),
+            transport=AioHttpTransport(),
         ),
         sender_email=os.getenv("MEMBRANE_SENDER_EMAIL"),
         subject=os.getenv("MEMBRANE_EMAIL_SUBJECT", emails.DEFAULT_EMAIL_SUBJECT),
@@ -100,6 +121,19 @@ def create_app():
         ),
     )
 
+    # Client token signatures are verified in the event loop unless workers are set.
+    jwt_verification_workers = int(
+        os.getenv(
+            "MEMBRANE_JWT_VERIFICATION_WORKERS",
+            DEFAULT_MEMBRANE_JWT_VERIFICATION_WORKERS,
+        )
+    )
+    jwt_verification_executor = (
+        jwt_utils.create_verification_executor(jwt_config, jwt_verification_workers)
+        if jwt_verification_workers > 0
+        else None
+    )
+
     app = Quart(__name__)
 
     app.config.update(
@@ -136,6 +170,7 @@ def create_app():
                 "MEMBRANE_GENERIC_500_ERROR", DEFAULT_MEMBRANE_GENERIC_500_ERROR
             ),
             "JWT_CONFIG": jwt_config,
+            "JWT_VERIFICATION_EXECUTOR": jwt_verification_executor,
             "EMAIL_CONFIG": email_config,
             "MEMBRANE_CORS_ALLOWED_ORIGINS": os.getenv(
                 "MEMBRANE_CORS_ALLOWED_ORIGINS"
@@ -162,4 +197,13 @@ def create_app():
         level=getattr(logging, app.config["MEMBRANE_LOGGING_LEVEL"]),
     )
     Session(app)
+
+    # The email client keeps its HTTP connections warm and the verification
+    # workers their keys for the lifetime of the worker, release them on shutdown.
+    @app.after_serving
+    async def close_shared_clients():  # pylint: disable=unused-variable
+        await email_config.email_client.close()
+        if jwt_verification_executor is not None:
+            jwt_verification_executor.shutdown()
+
     return app
@@ -1,7 +1,10 @@
-from dataclasses import dataclass
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
 from logging import Logger
 
-from azure.communication.email import EmailClient
+from azure.communication.email.aio import EmailClient
 
 DEFAULT_HTML_CONTENT = "<html><h1>{}</h1></html>"
 DEFAULT_POLLER_WAIT_SECONDS = 10
@@ -39,33 +42,46 @@ class EmailConfig:
     html_content: str = DEFAULT_HTML_CONTENT
     poller_wait_seconds: int = DEFAULT_POLLER_WAIT_SECONDS
     timeout: int = DEFAULT_TIMEOUT_SECONDS
-
-
-def send_email(recipient_email, body: str, config: EmailConfig, logger: Logger) -> dict:
+    validation_regex: re.Pattern = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.validation_regex = re.compile(self.validation_pattern)
+
+
+def build_email_message(recipient_email, body: str, config: EmailConfig) -> dict:
+    """
+    Build the message sent by the email client. A dict literal is cheaper than
+    copying a prebuilt template, so only the body formatting is done per email.
+    """
+    return {
+        "content": {
+            "subject": config.subject,
+            "plainText": body,
+            "html": config.html_content.format(body),
+        },
+        "recipients": {"to": [{"address": recipient_email}]},
+        "senderAddress": config.sender_email,
+    }
+
+
+async def send_email(
+    recipient_email, body: str, config: EmailConfig, logger: Logger
+) -> dict:
     try:
-        message = {
-            "content": {
-                "subject": config.subject,
-                "plainText": body,
-                "html": config.html_content.format(body),
-            },
-            "recipients": {"to": [{"address": recipient_email}]},
-            "senderAddress": config.sender_email,
-        }
-
-        time_elapsed = 0
-        poller = config.email_client.begin_send(message)
-        while not poller.done():
-            logger.debug(f"Email send poller status: {poller.status()}")
-            poller.wait(config.poller_wait_seconds)
-            time_elapsed += config.poller_wait_seconds
-
-            if time_elapsed > config.timeout:
-                raise PollingTimeoutError("Polling timed out.")
-
-        result = poller.result()
+        message = build_email_message(recipient_email, body, config)
+
+        poller = await config.email_client.begin_send(
+            message, polling_interval=config.poller_wait_seconds
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Email send poller status: %s", poller.status())
+        try:
+            result = await asyncio.wait_for(poller.result(), timeout=config.timeout)
+        except asyncio.TimeoutError as e:
+            raise PollingTimeoutError("Polling timed out.") from e
+
         if result["status"] == "Succeeded":
-            logger.info(f"Successfully sent the email (operation id: {result['id']})")
+            logger.info("Successfully sent the email (operation id: %s)", result["id"])
             return {"status": "Succeeded", "operation_id": result["id"]}
         else:
             raise EmailSendingFailedError(result["error"], None)
@@ -76,3 +92,21 @@ def send_email(recipient_email, body: str, config: EmailConfig, logger: Logger)
     except Exception as e:
         logger.exception(e)
         raise UnexpectedEmailSendError(f"An unexpected error occurred: {e}") from e
+
+
+async def send_emails(emails, config: EmailConfig, logger: Logger) -> list:
+    """
+    Send (recipient_email, body) pairs concurrently through the shared email client.
+
+    Every message is submitted before any result is awaited, so a batch takes
+    about one round-trip instead of one per email. Failures do not stop the
+    batch: the returned list holds, in input order, the result dict of each sent
+    email or the EmailsException raised for it.
+    """
+    return await asyncio.gather(
+        *(
+            send_email(recipient_email, body, config, logger)
+            for recipient_email, body in emails
+        ),
+        return_exceptions=True,
+    )
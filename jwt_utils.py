@@ -1,17 +1,28 @@
 """
 Utilities for encoding, decoding, and validating JWT tokens.
 """
+import asyncio
+import base64
+import hashlib
 import logging
-from copy import copy
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from pathlib import Path
 
+import orjson
+from cachetools import TLRUCache, TTLCache
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
 from jwt import decode, encode
 from jwt import exceptions as jwt_exceptions
+from jwt.algorithms import get_default_algorithms
 from quart import redirect, url_for
 
 DEFAULT_CLIENT_PUBLIC_KEYS_DIRECTORY = "./keys/client"
+CLIENT_PUBLIC_KEY_SUFFIX = "_public_key.pem"
 DEFAULT_SERVER_PUBLIC_KEY = "./keys/server_public.pem"
 DEFAULT_SERVER_PRIVATE_KEY = "./keys/server_private.pem"
 DEFAULT_APP_ID_FIELD = "app_id"
@@ -21,6 +32,20 @@ DEFAULT_DATA_FIELD = "data"
 DEFAULT_JWT_ACCESS_TOKEN_EXPIRE_SECONDS = 300
 DEFAULT_JWT_EXPIRE_SECONDS = 300
 DEFAULT_TOKEN_BLACKLIST = ""
+DEFAULT_TOKEN_BLACKLIST_SIZE = 100000
+DEFAULT_CLIENT_TOKEN_CACHE_SIZE = 10000
+DEFAULT_CLIENT_TOKEN_CACHE_TTL_SECONDS = 5
+
+# Expiration is verified by PyJWT, but only if the claim is present.
+_DECODE_OPTIONS = {"require": ["exp"]}
+
+# Parsed key objects, keyed by key file path, with the modification time they
+# were read at.
+_PUBLIC_KEY_CACHE = {}
+_PRIVATE_KEY_CACHE = {}
+
+# Client public keys of a verification worker process.
+_worker_key_registry = None
 
 
 class JWTError(Exception):
@@ -59,6 +84,145 @@ class JWTExpired(JWTError):
     """Raised when the provided token is expired."""
 
 
+@dataclass(frozen=True, slots=True)
+class Claims:
+    """Verified claims of a token, with the fields read on every request."""
+
+    sub: str
+    redirect_url: str
+    exp: int
+    raw: dict
+
+    @classmethod
+    def from_decoded_token(cls, decoded_token: dict, redirect_url_field: str):
+        return cls(
+            sub=decoded_token.get("sub"),
+            redirect_url=decoded_token[redirect_url_field],
+            exp=int(decoded_token["exp"]),
+            raw=decoded_token,
+        )
+
+
+def hash_token(jwt_token: str) -> bytes:
+    """
+    Return the SHA-256 digest of a token, computed once per request and shared by
+    the verified token cache and the blacklist. Functions taking a token_hash
+    only hash the token themselves when none is given.
+    """
+    return hashlib.sha256(jwt_token.encode()).digest()
+
+
+class _ConsumedTokenCache(TLRUCache):
+    """TLRU cache of consumed tokens, warning when a live token has to be evicted."""
+
+    def popitem(self):
+        # Expired entries are removed before inserting, so an entry evicted to
+        # make room has not expired yet
+        digest, entry = super().popitem()
+        logging.warning(
+            "Token blacklist is full, a consumed email token was forgotten before "
+            "its expiration at %s and can be used again",
+            entry[0],
+        )
+        return digest, entry
+
+
+class TokenBlacklist:
+    """
+    Bounded set of blacklisted tokens, stored as truncated SHA-256 digests.
+
+    Tokens revoked through configuration are kept for the lifetime of the
+    process. Consumed tokens are only kept until their own expiration, after
+    which the signature check rejects them anyway, along with their already
+    verified claims. When maxsize consumed tokens are still valid, the one
+    expiring first is evicted to make room and can be used again until it
+    expires, which is logged as a warning.
+    """
+
+    def __init__(self, tokens=(), maxsize: int = DEFAULT_TOKEN_BLACKLIST_SIZE):
+        if maxsize < 1:
+            raise ValueError(
+                f"The token blacklist size must be at least 1, got {maxsize}."
+            )
+        self._revoked = frozenset(hash_token(token)[:16] for token in tokens if token)
+        self._consumed = _ConsumedTokenCache(
+            maxsize=maxsize,
+            ttu=lambda _digest, entry, _now: entry[0],
+            timer=time.time,
+        )
+
+    def add(self, token_hash: bytes, expires_at: float, claims: Claims = None):
+        self._consumed[token_hash[:16]] = (expires_at, claims)
+
+    def get(self, token_hash: bytes):
+        """Return the verified claims of a consumed token, if still remembered."""
+        entry = self._consumed.get(token_hash[:16])
+        return entry[1] if entry is not None else None
+
+    def __contains__(self, token_hash: bytes) -> bool:
+        digest = token_hash[:16]
+        return digest in self._revoked or digest in self._consumed
+
+    def __len__(self) -> int:
+        return len(self._revoked) + len(self._consumed)
+
+
+class KeyRegistry:
+    """
+    Public keys of the client applications, keyed by app_id, prepared for the
+    verifier of the configured algorithm.
+
+    Keys are read from the `{app_id}_public_key.pem` files of keys_directory.
+    Every lookup compares the modification time of the directory with the one
+    of the last scan and rescans it when they differ, so added, removed
+    (revoked) or renamed key files are seen on the next request for the cost of
+    one stat(). A key file overwritten in place does not change the directory,
+    replacing a key should write the new file and rename it over the old one.
+    """
+
+    def __init__(self, keys_directory: Path, algorithm: str = DEFAULT_ENCODE_ALGORITHM):
+        self.keys_directory = keys_directory
+        self.verifier = get_default_algorithms()[algorithm]
+        self._keys = {}
+        self._directory_mtime = None
+        self._complete = False
+        self.reload()
+
+    def _read_directory_mtime(self):
+        try:
+            return self.keys_directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self):
+        # Read the modification time first, so files added during the scan
+        # trigger another one
+        directory_mtime = self._read_directory_mtime()
+        keys = {}
+        complete = True
+        for key_path in self.keys_directory.glob(f"*{CLIENT_PUBLIC_KEY_SUFFIX}"):
+            app_id = key_path.name[: -len(CLIENT_PUBLIC_KEY_SUFFIX)]
+            try:
+                keys[app_id] = self.verifier.prepare_key(
+                    load_pem_public_key(key_path.read_bytes())
+                )
+            except (OSError, ValueError) as error:
+                # A key file may still be being written, the next lookup
+                # scans the directory again
+                logging.error(
+                    "Failed to load client public key %s: %s", key_path, error
+                )
+                complete = False
+        self._keys = keys
+        self._directory_mtime = directory_mtime
+        self._complete = complete
+
+    def get(self, app_id):
+        if not self._complete or self._read_directory_mtime() != self._directory_mtime:
+            self.reload()
+        return self._keys.get(app_id)
+
+
 @dataclass
 class JWTConfig:
     client_public_keys_folder: Path
@@ -70,62 +234,315 @@ class JWTConfig:
     data_field: str = DEFAULT_DATA_FIELD
     jwt_access_token_expire_seconds: int = DEFAULT_JWT_ACCESS_TOKEN_EXPIRE_SECONDS
     jwt_expire_seconds: int = DEFAULT_JWT_EXPIRE_SECONDS
-    token_blacklist: set = field(default_factory=set)
+    token_blacklist: TokenBlacklist = field(default_factory=TokenBlacklist)
     token_type: str = "JWT"
+    client_token_cache_size: int = DEFAULT_CLIENT_TOKEN_CACHE_SIZE
+    client_token_cache_ttl_seconds: int = DEFAULT_CLIENT_TOKEN_CACHE_TTL_SECONDS
+    client_token_cache: TTLCache = field(init=False, repr=False)
+    algorithms: list = field(init=False, repr=False)
+    client_public_keys: KeyRegistry = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Allowed algorithms as passed to every decode call.
+        self.algorithms = [self.algorithm]
+        self.client_public_keys = KeyRegistry(
+            self.client_public_keys_folder, self.algorithm
+        )
+        # Successfully verified client tokens, keyed by the digest of the raw token.
+        if self.client_token_cache_size < 1:
+            raise ValueError(
+                "The client token cache size must be at least 1, got "
+                f"{self.client_token_cache_size}."
+            )
+        self.client_token_cache = TTLCache(
+            maxsize=self.client_token_cache_size,
+            ttl=self.client_token_cache_ttl_seconds,
+        )
 
 
-def decode_client_jwt_token(jwt_token, config: JWTConfig):
-    if not jwt_token:
-        raise JWTError("No JWT token provided in query parameters.")
+def _load_key(key_path: Path, cache: dict, loader):
+    """Return the parsed key at key_path, parsing the file again only if changed."""
+    modified_time = key_path.stat().st_mtime_ns
+    cached_key = cache.get(key_path)
+    if cached_key is not None and cached_key[0] == modified_time:
+        return cached_key[1]
+    key = loader(key_path.read_bytes())
+    cache[key_path] = (modified_time, key)
+    return key
+
+
+def _get_public_key(key_path: Path):
+    return _load_key(key_path, _PUBLIC_KEY_CACHE, load_pem_public_key)
+
+
+def _get_private_key(key_path: Path):
+    return _load_key(
+        key_path,
+        _PRIVATE_KEY_CACHE,
+        lambda key_data: load_pem_private_key(key_data, password=None),
+    )
+
+
+def _base64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _split_token(jwt_token: str):
+    """
+    Split a token into its parsed header and payload, the signing input and the
+    signature, without verifying anything.
+    """
     try:
-        # Temporarily decode the token to fetch the app_id
-        unverified_decoded_token = decode(
-            jwt_token, options={"verify_signature": False}
+        signing_input, _, signature_segment = jwt_token.rpartition(".")
+        header_segment, payload_segment = signing_input.split(".")
+        header = orjson.loads(_base64url_decode(header_segment))
+        payload = orjson.loads(_base64url_decode(payload_segment))
+        signature = _base64url_decode(signature_segment)
+    except ValueError as error:
+        raise jwt_exceptions.DecodeError("Invalid token segments.") from error
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        raise jwt_exceptions.DecodeError("Invalid token segments.")
+    return header, payload, signing_input.encode(), signature
+
+
+def _verify_client_token(
+    header: dict,
+    payload: dict,
+    signing_input: bytes,
+    signature: bytes,
+    public_key,
+    verifier,
+    algorithm: str,
+):
+    """
+    Verify the signature and the time claims of a split client token, as
+    jwt.decode would for the configured algorithm.
+    """
+    if header.get("alg") != algorithm:
+        raise jwt_exceptions.InvalidAlgorithmError(
+            "The specified alg value is not allowed"
         )
-        if config.app_id_field not in unverified_decoded_token:
-            raise JWTAppIdMissingError("No app id in JWT payload.")
+    if not verifier.verify(signing_input, public_key, signature):
+        raise jwt_exceptions.InvalidSignatureError("Signature verification failed")
+
+    now = time.time()
+    if "exp" not in payload:
+        raise jwt_exceptions.MissingRequiredClaimError("exp")
+    if "iat" in payload:
+        iat = _int_claim(
+            payload,
+            "iat",
+            jwt_exceptions.InvalidIssuedAtError,
+            "Issued At claim (iat) must be an integer.",
+        )
+        if iat > now:
+            raise jwt_exceptions.ImmatureSignatureError(
+                "The token is not yet valid (iat)"
+            )
+    if "nbf" in payload:
+        nbf = _int_claim(
+            payload,
+            "nbf",
+            jwt_exceptions.DecodeError,
+            "Not Before claim (nbf) must be an integer.",
+        )
+        if nbf > now:
+            raise jwt_exceptions.ImmatureSignatureError(
+                "The token is not yet valid (nbf)"
+            )
+    exp = _int_claim(
+        payload,
+        "exp",
+        jwt_exceptions.DecodeError,
+        "Expiration Time claim (exp) must be an integer.",
+    )
+    if exp <= now:
+        raise jwt_exceptions.ExpiredSignatureError("Signature has expired")
+    # No audience is configured, so any audience the token names is not ours.
+    if payload.get("aud"):
+        raise jwt_exceptions.InvalidAudienceError("Invalid audience")
+
+
+def _int_claim(payload: dict, claim: str, error_class: type, message: str) -> int:
+    """Read a numeric date claim the way jwt.decode does, truncated to an int."""
+    try:
+        return int(payload[claim])
+    except (TypeError, ValueError, OverflowError):
+        raise error_class(message) from None
 
-        app_id = unverified_decoded_token[config.app_id_field]
 
-        # Look for a corresponding public key file
-        public_key_path = config.client_public_keys_folder / f"{app_id}_public_key.pem"
+def _init_verification_worker(keys_directory: Path, algorithm: str):
+    global _worker_key_registry  # pylint: disable=global-statement
+    _worker_key_registry = KeyRegistry(keys_directory, algorithm)
 
-        if not public_key_path.exists():
-            raise JWTPublicKeyNotFoundError(
-                f"Public key not found for app_id: {app_id} {unverified_decoded_token}."
-            )
 
-        with public_key_path.open("r") as key_file:
-            public_key = key_file.read()
+def _verify_client_token_in_worker(
+    header: dict,
+    payload: dict,
+    signing_input: bytes,
+    signature: bytes,
+    app_id: str,
+    algorithm: str,
+):
+    public_key = _worker_key_registry.get(app_id)
+    if public_key is None:
+        raise JWTPublicKeyNotFoundError(f"Public key not found for app_id: {app_id}.")
+    _verify_client_token(
+        header,
+        payload,
+        signing_input,
+        signature,
+        public_key,
+        _worker_key_registry.verifier,
+        algorithm,
+    )
+
+
+def create_verification_executor(config: JWTConfig, max_workers: int = None):
+    """
+    Create a process pool verifying client token signatures outside of the event
+    loop, each worker loading the client public keys once.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_verification_worker,
+        initargs=(config.client_public_keys_folder, config.algorithm),
+    )
+
+
+def _get_cached_client_token(token_hash: bytes, config: JWTConfig):
+    cached_token = config.client_token_cache.get(token_hash)
+    if cached_token is not None and time.time() > cached_token.exp:
+        config.client_token_cache.pop(token_hash, None)
+        raise JWTExpired("JWT token has expired.")
+    return cached_token
+
+
+def _split_client_token(jwt_token: str, config: JWTConfig):
+    # Parse the token once, the app_id is read before verification
+    header, unverified_decoded_token, signing_input, signature = _split_token(jwt_token)
+    if config.app_id_field not in unverified_decoded_token:
+        raise JWTAppIdMissingError("No app id in JWT payload.")
+
+    app_id = unverified_decoded_token[config.app_id_field]
+
+    # Look for a corresponding public key, an app_id that is not a string
+    # names no key file
+    public_key = (
+        config.client_public_keys.get(app_id) if isinstance(app_id, str) else None
+    )
+    if public_key is None:
+        raise JWTPublicKeyNotFoundError(
+            f"Public key not found for app_id: {app_id} {unverified_decoded_token}."
+        )
+    return (
+        app_id,
+        public_key,
+        (header, unverified_decoded_token, signing_input, signature),
+    )
+
+
+def _accept_client_token(token_hash: bytes, decoded_token: dict, config: JWTConfig):
+    # Retrieve the redirect URL.
+    claims = Claims.from_decoded_token(decoded_token, config.redirect_url_field)
+    if not claims.redirect_url:
+        raise JWTError("No redirect URL found in Token.")
+
+    # Only successful validations are cached, invalid tokens are always
+    # checked again.
+    config.client_token_cache[token_hash] = claims
+    return claims
+
+
+def decode_client_jwt_token(jwt_token, config: JWTConfig, token_hash: bytes = None):
+    if not jwt_token:
+        raise JWTError("No JWT token provided in query parameters.")
+
+    # The app_id is part of the signed payload, so the token digest alone
+    # identifies the verified claims.
+    if token_hash is None:
+        token_hash = hash_token(jwt_token)
+    cached_token = _get_cached_client_token(token_hash, config)
+    if cached_token is not None:
+        return cached_token
+
+    try:
+        _, public_key, token_parts = _split_client_token(jwt_token, config)
+        # Verify the token using the fetched public key
+        _verify_client_token(
+            *token_parts,
+            public_key,
+            config.client_public_keys.verifier,
+            config.algorithm,
+        )
+        return _accept_client_token(token_hash, token_parts[1], config)
 
-        # Decode the token using the fetched public key
-        decoded_token = decode(jwt_token, public_key, algorithms=[config.algorithm])
-        # Retrieve the redirect URL.
-        redirect_url = decoded_token[config.redirect_url_field]
-        if not redirect_url:
-            raise JWTError("No redirect URL found in Token.")
+    except jwt_exceptions.ExpiredSignatureError as error:
+        raise JWTExpired("JWT token has expired.") from error
+    except jwt_exceptions.InvalidTokenError as error:
+        raise JWTError(f"{error}") from error
 
-        expired_time = decoded_token["exp"]
 
-        # Get current time
-        current_time = datetime.utcnow()
-        current_timestamp = int(current_time.timestamp())
+async def decode_client_jwt_token_async(
+    jwt_token,
+    config: JWTConfig,
+    executor: ProcessPoolExecutor = None,
+    token_hash: bytes = None,
+):
+    """
+    Decode a client token as decode_client_jwt_token does, verifying the signature
+    of tokens missing from the cache in executor when one is given. If the
+    executor is broken or shut down, the signature is verified in the event loop.
+    """
+    if executor is None:
+        return decode_client_jwt_token(jwt_token, config, token_hash)
+    if not jwt_token:
+        raise JWTError("No JWT token provided in query parameters.")
 
-        # Check for token expiration
-        if current_timestamp > expired_time:
-            raise JWTExpired("JWT token has expired.")
+    if token_hash is None:
+        token_hash = hash_token(jwt_token)
+    cached_token = _get_cached_client_token(token_hash, config)
+    if cached_token is not None:
+        return cached_token
 
-        return decoded_token
+    try:
+        app_id, public_key, token_parts = _split_client_token(jwt_token, config)
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                executor,
+                _verify_client_token_in_worker,
+                *token_parts,
+                app_id,
+                config.algorithm,
+            )
+        except RuntimeError as error:
+            # BrokenProcessPool once a worker died, or an executor already shut
+            # down: the pool is not rebuilt, tokens are verified in the loop.
+            logging.error("Verification workers unavailable: %r", error)
+            _verify_client_token(
+                *token_parts,
+                public_key,
+                config.client_public_keys.verifier,
+                config.algorithm,
+            )
+        return _accept_client_token(token_hash, token_parts[1], config)
 
+    except jwt_exceptions.ExpiredSignatureError as error:
+        raise JWTExpired("JWT token has expired.") from error
     except jwt_exceptions.InvalidTokenError as error:
         raise JWTError(f"{error}") from error
 
 
 def login_redirect_with_client_jwt(
-    membrane_frontend: str, client_app_token: str, config: JWTConfig
+    membrane_frontend: str,
+    client_app_token: str,
+    config: JWTConfig,
+    token_hash: bytes = None,
 ):
     try:
-        decode_client_jwt_token(client_app_token, config)
+        # Tokens already validated by the caller are served from the verified
+        # client token cache, without another signature check.
+        decode_client_jwt_token(client_app_token, config, token_hash)
         redirect_url_with_token = f"{membrane_frontend}?token={client_app_token}"
         return redirect(redirect_url_with_token)
     except Exception as error:
@@ -135,42 +552,56 @@ def login_redirect_with_client_jwt(
         ) from error
 
 
-def process_email_verification_token(email_token: str, config: JWTConfig):
+def process_email_verification_token(
+    email_token: str, config: JWTConfig, token_hash: bytes = None
+):
     try:
-        decoded_email_token = decode_email_verification_token(email_token, config)
-        config.token_blacklist.add(email_token)
-        email_token_redirect = (
-            f"{decoded_email_token[config.redirect_url_field]}?token={email_token}"
+        if token_hash is None and email_token:
+            token_hash = hash_token(email_token)
+        decoded_email_token = decode_email_verification_token(
+            email_token, config, token_hash
         )
+        config.token_blacklist.add(
+            token_hash, decoded_email_token.exp, decoded_email_token
+        )
+        email_token_redirect = f"{decoded_email_token.redirect_url}?token={email_token}"
         return redirect(email_token_redirect, code=302)
     except JWTError as error:
-        logging.error(f"Failed to verify and decode email token: {error}")
+        logging.error("Failed to verify and decode email token: %s", error)
         raise
 
 
-def decode_email_verification_token(jwt_token: str, config: JWTConfig):
+def decode_email_verification_token(
+    jwt_token: str,
+    config: JWTConfig,
+    token_hash: bytes = None,
+    check_blacklist: bool = True,
+):
     if not jwt_token:
         raise JWTError("No JWT token provided in query parameters.")
-    if jwt_token in config.token_blacklist:
+    if token_hash is None:
+        token_hash = hash_token(jwt_token)
+    if check_blacklist and token_hash in config.token_blacklist:
         raise BlacklistedTokenError("This token has been blacklisted.")
-    with config.server_public_key.open("r") as key_file:
-        public_key = key_file.read()
+    public_key = _get_public_key(config.server_public_key)
     try:
-        decoded_token = decode(jwt_token, public_key, algorithms=[config.algorithm])
+        decoded_token = decode(
+            jwt_token,
+            public_key,
+            algorithms=config.algorithms,
+            options=_DECODE_OPTIONS,
+        )
         if config.redirect_url_field not in decoded_token:
             raise JWTError("No redirect URL found in token.")
-        expired_time = decoded_token["exp"]
-        current_time = datetime.utcnow()
-        if current_time.timestamp() > expired_time:
-            raise JWTExpired("JWT token has expired.")
-        return decoded_token
+        return Claims.from_decoded_token(decoded_token, config.redirect_url_field)
+    except jwt_exceptions.ExpiredSignatureError as error:
+        raise JWTExpired("JWT token has expired.") from error
     except jwt_exceptions.InvalidTokenError as error:
         raise InvalidTokenError(str(error)) from error
 
 
 def generate_email_verification_token(email: str, redirect_url: str, config: JWTConfig):
-    expiration_time = datetime.utcnow() + timedelta(seconds=config.jwt_expire_seconds)
-    expiration_timestamp = int(expiration_time.timestamp())
+    expiration_timestamp = int(time.time()) + config.jwt_expire_seconds
     payload = {
         "sub": email,
         "exp": expiration_timestamp,
@@ -182,10 +613,10 @@ def generate_email_verification_token(email: str, redirect_url: str, config: JWT
 
 
 def encode_email_verification_token(payload: dict, config: JWTConfig):
-    if not config.server_private_key.exists():
-        raise JWTPrivateKeyNotFoundError("Private key not found")
-    with config.server_private_key.open("r") as key_file:
-        private_key = key_file.read()
+    try:
+        private_key = _get_private_key(config.server_private_key)
+    except FileNotFoundError as error:
+        raise JWTPrivateKeyNotFoundError("Private key not found") from error
     try:
         jwt_token = encode(payload, private_key, algorithm=config.algorithm)
         return jwt_token
@@ -194,10 +625,12 @@ def encode_email_verification_token(payload: dict, config: JWTConfig):
 
 
 def redirect_to_client_app_using_verification_token(
-    verification_token: str, config: JWTConfig
+    verification_token: str, config: JWTConfig, token_hash: bytes = None
 ):
+    if token_hash is None and verification_token:
+        token_hash = hash_token(verification_token)
     try:
-        return process_email_verification_token(verification_token, config)
+        return process_email_verification_token(verification_token, config, token_hash)
     except BlacklistedTokenError:
         logging.exception("Token is blacklisted, trying without blacklist...")
     except InvalidTokenError:
@@ -205,13 +638,13 @@ def redirect_to_client_app_using_verification_token(
         raise
 
     try:
-        _config = copy(config)
-        _config.token_blacklist = []
-        verification_decoded_token = decode_email_verification_token(
-            verification_token,
-            _config,
-        )
-        return redirect(verification_decoded_token[config.redirect_url_field])
+        # Consumed tokens keep their verified claims, only revoked ones are decoded.
+        verification_decoded_token = config.token_blacklist.get(token_hash)
+        if verification_decoded_token is None:
+            verification_decoded_token = decode_email_verification_token(
+                verification_token, config, token_hash, check_blacklist=False
+            )
+        return redirect(verification_decoded_token.redirect_url)
     except (InvalidTokenError, BlacklistedTokenError) as error:
         raise InvalidEmailTokenError(
             "Failed to decode client application token."
@@ -25,9 +25,11 @@ class InvalidTokenError(TokenError):
 
 
 def is_valid_email(email, pattern):
-    """Check if the provided email is valid."""
+    """Check if the provided email matches a pattern string or compiled pattern."""
 
-    if not re.match(pattern, email):
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+    if not pattern.match(email):
         raise EmailError(f"Invalid email address: {email}")
     return True
 
@@ -44,3 +46,18 @@ def validate_email_from_request(email, pattern):
         raise EmailError("Invalid email address.")
 
     return email
+
+
+def validate_emails_from_request(emails, pattern):
+    """Validate a list of emails, reporting every invalid address at once."""
+
+    if not emails:
+        raise EmailError("Missing emails.")
+
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+    invalid_emails = [email for email in emails if not pattern.match(email)]
+    if invalid_emails:
+        raise EmailError(f"Invalid email addresses: {', '.join(invalid_emails)}")
+
+    return emails
@@ -16,7 +16,11 @@ with patch("app_create.create_app") as mock_create_app:
     from app import app
 
 from emails import EmailConfig  # noqa: E402
-from jwt_utils import JWTConfig, generate_email_verification_token  # noqa: E402
+from jwt_utils import (  # noqa: E402
+    JWTConfig,
+    TokenBlacklist,
+    generate_email_verification_token,
+)
 
 
 class TestConfig(unittest.TestCase):
@@ -44,7 +48,7 @@ class TestConfig(unittest.TestCase):
             data_field="data",
             jwt_access_token_expire_seconds=300,
             jwt_expire_seconds=300,
-            token_blacklist=set(),
+            token_blacklist=TokenBlacklist(),
         )
 
     @classmethod
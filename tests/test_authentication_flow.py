@@ -7,6 +7,8 @@ from unittest.mock import patch
 
 from conftest import TestConfig
 
+import jwt_utils
+
 
 class TestAuthenticationFlow(TestConfig, IsolatedAsyncioTestCase):
     async def test_missing_token_returns_405_method_not_allowed(self):
@@ -24,6 +26,19 @@ class TestAuthenticationFlow(TestConfig, IsolatedAsyncioTestCase):
         response = await self.test_client.get(f"/authenticate?token={sample_jwt_token}")
         self.assertEqual(response.status_code, 302)
 
+    async def test_client_jwt_redirect_verifies_signature_once(self):
+        self.payload.update({self.jwt_config.data_field: "redirect_once"})
+        sample_jwt_token = self.generate_jwt_token(
+            self.payload, self.jwt_config, "testapp1"
+        )
+        verifier = self.jwt_config.client_public_keys.verifier
+        with patch.object(verifier, "verify", wraps=verifier.verify) as mock_verify:
+            response = await self.test_client.get(
+                f"/authenticate?token={sample_jwt_token}"
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mock_verify.call_count, 1)
+
     @patch("app.app.add_background_task")
     async def test_email_provided_returns_200_ok(self, mock_add_background_task):
         mock_add_background_task.return_value = None
@@ -60,6 +75,28 @@ class TestAuthenticationFlow(TestConfig, IsolatedAsyncioTestCase):
         response = await self.test_client.get(sample_verification_token)
         self.assertEqual(response.status_code, 302)
 
+    async def test_verification_token_is_hashed_once(self):
+        sample_verification_token = await self.sample_verification_token()
+        with patch(
+            "app.hash_token", wraps=jwt_utils.hash_token
+        ) as mock_route_hash, patch(
+            "jwt_utils.hash_token", wraps=jwt_utils.hash_token
+        ) as mock_hash:
+            response = await self.test_client.get(sample_verification_token)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mock_route_hash.call_count + mock_hash.call_count, 1)
+
+    async def test_reused_verification_token_redirects_without_decoding(self):
+        sample_verification_token = await self.sample_verification_token()
+        response = await self.test_client.get(sample_verification_token)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("?token=", response.headers["Location"])
+        with patch("jwt_utils.decode", wraps=jwt_utils.decode) as mock_decode:
+            response = await self.test_client.get(sample_verification_token)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.headers["Location"], "https://www.example.com/")
+        mock_decode.assert_not_called()
+
     async def test_invalid_verification_token_returns_405_method_not_allowed(self):
         sample_verification_token = await self.sample_verification_token()
         response = await self.test_client.get(
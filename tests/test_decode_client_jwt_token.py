@@ -1,11 +1,29 @@
 """
 Tests for JWT Token Decoding Operations.
 """
+import dataclasses
+import os
+import shutil
+import tempfile
+import time
 import unittest
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
 
+import jwt
 from conftest import TestConfig
 
-from jwt_utils import JWTError, JWTPublicKeyNotFoundError, decode_client_jwt_token
+import jwt_utils
+from jwt_utils import (
+    JWTError,
+    JWTExpired,
+    JWTPublicKeyNotFoundError,
+    KeyRegistry,
+    create_verification_executor,
+    decode_client_jwt_token,
+    decode_client_jwt_token_async,
+)
 
 
 class TestJWTDecoding(TestConfig, unittest.TestCase):
@@ -21,6 +39,15 @@ class TestJWTDecoding(TestConfig, unittest.TestCase):
         with self.assertRaises(JWTPublicKeyNotFoundError):
             decode_client_jwt_token(jwt_token, self.jwt_config)
 
+    def test_decode_jwt_with_non_string_app_id(self):
+        for app_id in (["testapp1"], {"testapp1": True}):
+            self.payload.update({self.jwt_config.app_id_field: app_id})
+            jwt_token = self.generate_jwt_token(
+                self.payload, self.jwt_config, "testapp1"
+            )
+            with self.assertRaises(JWTPublicKeyNotFoundError):
+                decode_client_jwt_token(jwt_token, self.jwt_config)
+
     def test_decode_jwt_with_invalid_token(self):
         invalid_jwt = "invalid.jwt.token"
         with self.assertRaises(Exception):
@@ -39,3 +66,261 @@ class TestJWTDecoding(TestConfig, unittest.TestCase):
         jwt_token = ".".join(jwt_parts)
         with self.assertRaises(Exception):
             decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_verified_token_is_cached(self):
+        jwt_config = self.setup_jwt_config()
+        jwt_token = self.generate_jwt_token(self.payload, jwt_config, "testapp1")
+        verifier = jwt_config.client_public_keys.verifier
+        with patch.object(verifier, "verify", wraps=verifier.verify) as mock_verify:
+            first = decode_client_jwt_token(jwt_token, jwt_config)
+            second = decode_client_jwt_token(jwt_token, jwt_config)
+        self.assertEqual(first, second)
+        self.assertEqual(mock_verify.call_count, 1)
+
+    def test_decode_jwt_invalid_token_is_not_cached(self):
+        jwt_config = self.setup_jwt_config()
+        jwt_token = self.generate_jwt_token(self.payload, jwt_config, "testapp1")
+        jwt_token = jwt_token[:-3] + "abc"
+        for _ in range(2):
+            with self.assertRaises(JWTError):
+                decode_client_jwt_token(jwt_token, jwt_config)
+        self.assertEqual(len(jwt_config.client_token_cache), 0)
+
+    def test_decode_jwt_cached_token_expires(self):
+        jwt_config = self.setup_jwt_config()
+        jwt_token = self.generate_jwt_token(self.payload, jwt_config, "testapp1")
+        decoded_token = decode_client_jwt_token(jwt_token, jwt_config)
+        with patch("jwt_utils.time.time", return_value=decoded_token.exp + 1):
+            with self.assertRaises(JWTExpired):
+                decode_client_jwt_token(jwt_token, jwt_config)
+        self.assertEqual(len(jwt_config.client_token_cache), 0)
+
+    def test_decode_jwt_public_key_is_parsed_once(self):
+        jwt_config = self.setup_jwt_config()
+        decode_client_jwt_token(
+            self.generate_jwt_token(self.payload, jwt_config, "testapp1"), jwt_config
+        )
+        self.payload.update({self.jwt_config.data_field: "other_data"})
+        jwt_token = self.generate_jwt_token(self.payload, jwt_config, "testapp1")
+        with patch("jwt_utils.load_pem_public_key") as mock_load_pem_public_key:
+            decode_client_jwt_token(jwt_token, jwt_config)
+        mock_load_pem_public_key.assert_not_called()
+
+    def test_decode_jwt_decodes_token_once(self):
+        jwt_config = self.setup_jwt_config()
+        jwt_token = self.generate_jwt_token(self.payload, jwt_config, "testapp1")
+        loads = jwt_utils.orjson.loads
+        with patch("jwt_utils.orjson.loads", wraps=loads) as mock_loads:
+            decoded_token = decode_client_jwt_token(jwt_token, jwt_config)
+        self.assertEqual(decoded_token.raw, self.payload)
+        # One parse for the header and one for the payload.
+        self.assertEqual(mock_loads.call_count, 2)
+
+    def test_decode_jwt_with_disallowed_algorithm(self):
+        jwt_token = jwt.encode(
+            {**self.payload, "exp": int(time.time()) + 60}, "s" * 32, "HS256"
+        )
+        with self.assertRaisesRegex(JWTError, "alg"):
+            decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_not_yet_valid(self):
+        self.payload.update({"nbf": int(time.time()) + 60})
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        with self.assertRaisesRegex(JWTError, "nbf"):
+            decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_with_non_integer_nbf(self):
+        self.payload.update({"nbf": "abc"})
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        with self.assertRaisesRegex(JWTError, "nbf"):
+            decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_issued_in_the_future(self):
+        self.payload.update({"iat": int(time.time()) + 60})
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        with self.assertRaisesRegex(JWTError, "iat"):
+            decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_with_non_integer_iat(self):
+        self.payload.update({"iat": "abc"})
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        with self.assertRaisesRegex(JWTError, "iat"):
+            decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_with_float_exp(self):
+        self.payload.update({"exp": time.time() + 60.5})
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        claims = decode_client_jwt_token(jwt_token, self.jwt_config)
+        self.assertEqual(claims.exp, int(self.payload["exp"]))
+
+    def test_decode_jwt_with_audience(self):
+        self.payload.update({"aud": "another-service"})
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        with self.assertRaisesRegex(JWTError, "audience"):
+            decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_with_non_object_payload(self):
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        jwt_parts = jwt_token.split(".")
+        jwt_parts[1] = "WzFd"
+        with self.assertRaises(JWTError):
+            decode_client_jwt_token(".".join(jwt_parts), self.jwt_config)
+
+    def test_decode_jwt_expired_token(self):
+        self.payload.update({"exp": int(time.time()) - 60})
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        with self.assertRaises(JWTExpired):
+            decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_without_expiration(self):
+        jwt_token = jwt.encode(
+            self.payload, self.client_private_key, self.jwt_config.algorithm
+        )
+        with self.assertRaisesRegex(JWTError, "exp"):
+            decode_client_jwt_token(jwt_token, self.jwt_config)
+
+    def test_decode_jwt_returns_claims(self):
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        claims = decode_client_jwt_token(jwt_token, self.jwt_config)
+        self.assertEqual(claims.redirect_url, "www.example.com")
+        self.assertEqual(claims.exp, self.payload["exp"])
+        self.assertIsNone(claims.sub)
+
+    def test_client_token_cache_size_must_be_positive(self):
+        with self.assertRaisesRegex(ValueError, "cache size"):
+            dataclasses.replace(self.jwt_config, client_token_cache_size=0)
+
+    def test_key_registry_loads_client_public_keys(self):
+        key_registry = KeyRegistry(self.jwt_config.client_public_keys_folder)
+        self.assertIsNotNone(key_registry.get("testapp1"))
+        self.assertIsNotNone(key_registry.get("testapp2"))
+        self.assertIsNone(key_registry.get("nonexistent"))
+
+    def test_key_registry_picks_up_added_keys(self):
+        keys_folder = self.jwt_config.client_public_keys_folder
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            shutil.copy(keys_folder / "testapp1_public_key.pem", directory)
+            key_registry = KeyRegistry(directory)
+            self.assertIsNone(key_registry.get("testapp2"))
+
+            shutil.copy(
+                keys_folder / "testapp2_public_key.pem",
+                directory / "newapp_public_key.pem",
+            )
+            # Force a different modification time on coarse filesystems
+            os.utime(directory, ns=(0, 0))
+            self.assertIsNotNone(key_registry.get("newapp"))
+
+    def test_decode_jwt_with_removed_public_key(self):
+        keys_folder = self.jwt_config.client_public_keys_folder
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            shutil.copy(keys_folder / "testapp1_public_key.pem", directory)
+            jwt_config = dataclasses.replace(
+                self.jwt_config, client_public_keys_folder=directory
+            )
+            jwt_token = self.generate_jwt_token(self.payload, jwt_config, "testapp1")
+            decode_client_jwt_token(jwt_token, jwt_config)
+
+            (directory / "testapp1_public_key.pem").unlink()
+            os.utime(directory, ns=(0, 0))
+            self.payload.update({"exp": self.payload["exp"] + 1})
+            jwt_token = self.generate_jwt_token(self.payload, jwt_config, "testapp1")
+            with self.assertRaises(JWTPublicKeyNotFoundError):
+                decode_client_jwt_token(jwt_token, jwt_config)
+
+    def test_key_registry_retries_unreadable_key_files(self):
+        keys_folder = self.jwt_config.client_public_keys_folder
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            shutil.copy(keys_folder / "testapp1_public_key.pem", directory)
+            key_path = directory / "newapp_public_key.pem"
+            key_path.write_bytes(b"-----BEGIN PUBLIC KEY-----\n")
+            key_registry = KeyRegistry(directory)
+            self.assertIsNotNone(key_registry.get("testapp1"))
+            self.assertIsNone(key_registry.get("newapp"))
+
+            shutil.copy(keys_folder / "testapp2_public_key.pem", key_path)
+            self.assertIsNotNone(key_registry.get("newapp"))
+
+    def test_key_registry_lookup_does_not_rescan_unchanged_directory(self):
+        key_registry = KeyRegistry(self.jwt_config.client_public_keys_folder)
+        with patch.object(key_registry, "reload") as reload:
+            self.assertIsNone(key_registry.get("nonexistent"))
+        reload.assert_not_called()
+
+
+class TestJWTDecodingAsync(TestConfig, IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.executor = create_verification_executor(cls.jwt_config, max_workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+        super().tearDownClass()
+
+    async def test_decode_jwt_async_in_executor(self):
+        jwt_config = self.setup_jwt_config()
+        jwt_token = self.generate_jwt_token(self.payload, jwt_config, "testapp1")
+        decoded_token = await decode_client_jwt_token_async(
+            jwt_token, jwt_config, self.executor
+        )
+        self.assertEqual(decoded_token.raw, self.payload)
+        self.assertIn(jwt_utils.hash_token(jwt_token), jwt_config.client_token_cache)
+
+    async def test_decode_jwt_async_invalid_signature(self):
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        jwt_token = jwt_token[:-3] + "abc"
+        with self.assertRaises(JWTError):
+            await decode_client_jwt_token_async(
+                jwt_token, self.setup_jwt_config(), self.executor
+            )
+
+    async def test_decode_jwt_async_expired_token(self):
+        self.payload.update({"exp": int(time.time()) - 60})
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        with self.assertRaises(JWTExpired):
+            await decode_client_jwt_token_async(
+                jwt_token, self.jwt_config, self.executor
+            )
+
+    async def test_decode_jwt_async_with_shut_down_executor(self):
+        executor = create_verification_executor(self.jwt_config, max_workers=1)
+        executor.shutdown()
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        decoded_token = await decode_client_jwt_token_async(
+            jwt_token, self.setup_jwt_config(), executor
+        )
+        self.assertEqual(decoded_token.raw, self.payload)
+
+    async def test_decode_jwt_async_with_broken_executor(self):
+        executor = create_verification_executor(self.jwt_config, max_workers=1)
+        try:
+            jwt_token = self.generate_jwt_token(
+                self.payload, self.jwt_config, "testapp1"
+            )
+            await decode_client_jwt_token_async(
+                jwt_token, self.setup_jwt_config(), executor
+            )
+            for process in list(executor._processes.values()):
+                process.kill()
+                process.join()
+
+            self.payload.update({self.jwt_config.data_field: "after_broken_pool"})
+            jwt_token = self.generate_jwt_token(
+                self.payload, self.jwt_config, "testapp1"
+            )
+            decoded_token = await decode_client_jwt_token_async(
+                jwt_token, self.setup_jwt_config(), executor
+            )
+            self.assertEqual(decoded_token.raw, self.payload)
+        finally:
+            executor.shutdown()
+
+    async def test_decode_jwt_async_without_executor(self):
+        jwt_token = self.generate_jwt_token(self.payload, self.jwt_config, "testapp1")
+        decoded_token = await decode_client_jwt_token_async(jwt_token, self.jwt_config)
+        self.assertEqual(decoded_token.raw, self.payload)
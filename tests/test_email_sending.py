@@ -1,6 +1,8 @@
-import unittest
+import asyncio
+import dataclasses
 from logging import getLogger
-from unittest.mock import MagicMock, patch
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from conftest import TestConfig
 
@@ -8,20 +10,22 @@ from emails import (
     EmailSendingFailedError,
     EmailsException,
     PollingTimeoutError,
+    build_email_message,
     send_email,
+    send_emails,
 )
 
 
-class TestEmailSending(TestConfig, unittest.TestCase):
-    def test_send_email_success(self):
+class TestEmailSending(TestConfig, IsolatedAsyncioTestCase):
+    async def test_send_email_success(self):
         logger = getLogger("testLogger")
         mock_result = {"status": "Succeeded", "id": "some_id"}
 
-        with patch("azure.communication.email.EmailClient") as MockEmailClient:
+        with patch("azure.communication.email.aio.EmailClient") as MockEmailClient:
             mock_instance = MockEmailClient.return_value
             mock_poller = MagicMock()
-            mock_poller.result.return_value = mock_result
-            mock_instance.begin_send.return_value = mock_poller
+            mock_poller.result = AsyncMock(return_value=mock_result)
+            mock_instance.begin_send = AsyncMock(return_value=mock_poller)
             self.email_config.email_client = mock_instance
             email = {
                 "recipient_email": "recipient_email",
@@ -30,22 +34,22 @@ class TestEmailSending(TestConfig, unittest.TestCase):
             }
 
             try:
-                result = send_email(**email, logger=logger)
+                result = await send_email(**email, logger=logger)
                 self.assertEqual(
                     result, {"status": "Succeeded", "operation_id": "some_id"}
                 )
             except EmailsException:
                 self.fail(f"Expected {email} to be successfully sent but was not.")
 
-    def test_send_email_fail(self):
+    async def test_send_email_fail(self):
         logger = getLogger("testLogger")
         mock_result = {"status": "Failed", "error": "some_error"}
 
-        with patch("azure.communication.email.EmailClient") as MockEmailClient:
+        with patch("azure.communication.email.aio.EmailClient") as MockEmailClient:
             mock_instance = MockEmailClient.return_value
             mock_poller = MagicMock()
-            mock_poller.result.return_value = mock_result
-            mock_instance.begin_send.return_value = mock_poller
+            mock_poller.result = AsyncMock(return_value=mock_result)
+            mock_instance.begin_send = AsyncMock(return_value=mock_poller)
             self.email_config.email_client = mock_instance
             email = {
                 "recipient_email": "recipient_email",
@@ -54,23 +58,97 @@ class TestEmailSending(TestConfig, unittest.TestCase):
             }
 
             with self.assertRaises(EmailSendingFailedError):
-                send_email(**email, logger=logger)
+                await send_email(**email, logger=logger)
 
-    def test_polling_timeout_error(self):
+    async def test_polling_timeout_error(self):
         logger = getLogger("testLogger")
 
-        with patch("azure.communication.email.EmailClient") as MockEmailClient:
+        async def never_done():
+            await asyncio.Event().wait()
+
+        with patch("azure.communication.email.aio.EmailClient") as MockEmailClient:
             mock_instance = MockEmailClient.return_value
             mock_poller = MagicMock()
-            mock_poller.done.return_value = False
-            mock_instance.begin_send.return_value = mock_poller
+            mock_poller.result = never_done
+            mock_instance.begin_send = AsyncMock(return_value=mock_poller)
 
-            self.email_config.email_client = mock_instance
             email = {
                 "recipient_email": "recipient_email",
                 "body": "body",
-                "config": self.email_config,
+                "config": dataclasses.replace(
+                    self.email_config, email_client=mock_instance, timeout=0.1
+                ),
             }
 
             with self.assertRaises(PollingTimeoutError):
-                send_email(**email, logger=logger)
+                await send_email(**email, logger=logger)
+
+    async def test_send_emails_batch(self):
+        logger = getLogger("testLogger")
+
+        async def sent_later():
+            await asyncio.sleep(0.1)
+            return {"status": "Succeeded", "id": "some_id"}
+
+        with patch("azure.communication.email.aio.EmailClient") as MockEmailClient:
+            mock_instance = MockEmailClient.return_value
+            mock_poller = MagicMock()
+            mock_poller.result = sent_later
+            mock_instance.begin_send = AsyncMock(return_value=mock_poller)
+            self.email_config.email_client = mock_instance
+            emails = [("recipient_email", "body")] * 5
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            results = await send_emails(emails, self.email_config, logger)
+            self.assertLess(loop.time() - started, 0.5)
+            self.assertEqual(
+                results, [{"status": "Succeeded", "operation_id": "some_id"}] * 5
+            )
+            self.assertEqual(mock_instance.begin_send.await_count, 5)
+
+    async def test_send_emails_batch_with_failure(self):
+        logger = getLogger("testLogger")
+        results_by_message = iter(
+            [
+                {"status": "Succeeded", "id": "first_id"},
+                {"status": "Failed", "error": "error_message"},
+                {"status": "Succeeded", "id": "third_id"},
+            ]
+        )
+
+        with patch("azure.communication.email.aio.EmailClient") as MockEmailClient:
+            mock_instance = MockEmailClient.return_value
+
+            async def begin_send(*args, **kwargs):
+                mock_poller = MagicMock()
+                mock_poller.result = AsyncMock(return_value=next(results_by_message))
+                return mock_poller
+
+            mock_instance.begin_send = begin_send
+            self.email_config.email_client = mock_instance
+            emails = [("recipient_email", "body")] * 3
+
+            results = await send_emails(emails, self.email_config, logger)
+            self.assertEqual(
+                results[0], {"status": "Succeeded", "operation_id": "first_id"}
+            )
+            self.assertIsInstance(results[1], EmailSendingFailedError)
+            self.assertEqual(
+                results[2], {"status": "Succeeded", "operation_id": "third_id"}
+            )
+
+    async def test_build_email_message(self):
+        message = build_email_message("recipient_email", "body", self.email_config)
+        self.assertEqual(
+            message,
+            {
+                "content": {
+                    "subject": self.email_config.subject,
+                    "plainText": "body",
+                    "html": "<html><h1>body</h1></html>",
+                },
+                "recipients": {"to": [{"address": "recipient_email"}]},
+                "senderAddress": self.email_config.sender_email,
+            },
+        )
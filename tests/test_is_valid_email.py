@@ -5,7 +5,7 @@ import unittest
 
 from conftest import TestConfig
 
-from request_helpers import EmailError, is_valid_email
+from request_helpers import EmailError, is_valid_email, validate_emails_from_request
 
 
 class TestEmailValidation(TestConfig, unittest.TestCase):
@@ -69,3 +69,37 @@ class TestEmailValidation(TestConfig, unittest.TestCase):
         self.assert_invalid_email(
             "user@inspection.gc.caa", self.email_config.validation_pattern
         )
+
+    def test_valid_email_with_compiled_pattern(self):
+        email = "test.user@inspection.gc.ca"
+        try:
+            self.assertTrue(is_valid_email(email, self.email_config.validation_regex))
+        except EmailError:
+            self.fail(f"Expected {email} to be valid but was not.")
+
+    def test_invalid_email_with_compiled_pattern(self):
+        self.assert_invalid_email(
+            "test.user@notallowed.com", self.email_config.validation_regex
+        )
+
+    def test_validate_emails_from_allowed_domains(self):
+        emails = ["test.user1@inspection.gc.ca", "test.user2@canada.ca"]
+        self.assertEqual(
+            validate_emails_from_request(emails, self.email_config.validation_regex),
+            emails,
+        )
+
+    def test_validate_emails_reports_every_invalid_email(self):
+        emails = [
+            "test.user1@inspection.gc.ca",
+            "test.user2@notallowed.com",
+            "user@canadaa.ca",
+        ]
+        with self.assertRaisesRegex(
+            EmailError, "test.user2@notallowed.com, user@canadaa.ca"
+        ):
+            validate_emails_from_request(emails, self.email_config.validation_pattern)
+
+    def test_validate_emails_missing(self):
+        with self.assertRaises(EmailError):
+            validate_emails_from_request([], self.email_config.validation_regex)
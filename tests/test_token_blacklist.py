@@ -0,0 +1,63 @@
+"""
+Tests for the Token Blacklist.
+"""
+import time
+import unittest
+from unittest.mock import patch
+
+from conftest import TestConfig
+
+from jwt_utils import Claims, TokenBlacklist, hash_token
+
+
+class TestTokenBlacklist(TestConfig, unittest.TestCase):
+    def test_revoked_token_is_blacklisted(self):
+        token_blacklist = TokenBlacklist(["revoked.jwt.token", ""])
+        self.assertIn(hash_token("revoked.jwt.token"), token_blacklist)
+        self.assertNotIn(hash_token(""), token_blacklist)
+        self.assertNotIn(hash_token("other.jwt.token"), token_blacklist)
+
+    def test_consumed_token_is_blacklisted_until_expiration(self):
+        token_blacklist = TokenBlacklist()
+        token_blacklist.add(hash_token("consumed.jwt.token"), time.time() + 60)
+        token_blacklist.add(hash_token("expired.jwt.token"), time.time() - 1)
+        self.assertIn(hash_token("consumed.jwt.token"), token_blacklist)
+        self.assertNotIn(hash_token("expired.jwt.token"), token_blacklist)
+
+    def test_consumed_tokens_are_bounded(self):
+        token_blacklist = TokenBlacklist(maxsize=2)
+        expires_at = time.time() + 60
+        for index in range(3):
+            token_blacklist.add(hash_token(f"consumed.jwt.token{index}"), expires_at)
+        self.assertEqual(len(token_blacklist), 2)
+        self.assertIn(hash_token("consumed.jwt.token2"), token_blacklist)
+
+    def test_evicting_live_consumed_token_logs_warning(self):
+        token_blacklist = TokenBlacklist(maxsize=1)
+        expires_at = time.time() + 60
+        token_blacklist.add(hash_token("consumed.jwt.token0"), expires_at)
+        with patch("jwt_utils.logging.warning") as mock_warning:
+            token_blacklist.add(hash_token("consumed.jwt.token1"), expires_at)
+        mock_warning.assert_called_once()
+        self.assertNotIn(hash_token("consumed.jwt.token0"), token_blacklist)
+
+    def test_token_blacklist_size_must_be_positive(self):
+        with self.assertRaisesRegex(ValueError, "blacklist size"):
+            TokenBlacklist(maxsize=0)
+
+    def test_token_blacklist_stores_digests(self):
+        jwt_token = "consumed.jwt.token"
+        token_blacklist = TokenBlacklist([jwt_token])
+        self.assertEqual(token_blacklist._revoked, {hash_token(jwt_token)[:16]})
+
+    def test_consumed_token_keeps_decoded_claims(self):
+        token_blacklist = TokenBlacklist(["revoked.jwt.token"])
+        expires_at = int(time.time()) + 60
+        claims = Claims.from_decoded_token(
+            {"redirect_url": "https://www.example.com/", "exp": expires_at},
+            "redirect_url",
+        )
+        token_hash = hash_token("consumed.jwt.token")
+        token_blacklist.add(token_hash, claims.exp, claims)
+        self.assertIs(token_blacklist.get(token_hash), claims)
+        self.assertIsNone(token_blacklist.get(hash_token("revoked.jwt.token")))